@@ -1,27 +1,41 @@
 """
 Main package for deploy-tool.
 This module ensures imports work properly.
+
+Names are imported from their submodules on first access, so importing this
+module does not load boto3 or gitpython.
 """
+import importlib
 
-from .cli import cli
-from .config import (
-    save_config, load_config, save_state, load_state,
-    validate_aws_credentials, ensure_config_dir
-)
-from .aws import (
-    get_aws_session, create_s3_bucket, delete_s3_bucket,
-    verify_aws_credentials
-)
-from .github import clone_repository, detect_framework, build_project
-from .resources import display_resources, get_resources_summary
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    'cli': '.cli',
+    'save_state': '.config', 'load_state': '.config',
+    'flush_state': '.config', 'clear_state': '.config',
+    'ensure_config_dir': '.config',
+    'get_aws_session': '.aws', 'create_s3_bucket': '.aws', 'delete_s3_bucket': '.aws',
+    'verify_aws_credentials': '.aws',
+    'clone_repository': '.github', 'detect_framework': '.github', 'build_project': '.github',
+    'display_resources': '.resources', 'get_resources_summary': '.resources'
+}
 
 __all__ = [
     'cli',
-    'save_config', 'load_config',
     'save_state', 'load_state',
-    'validate_aws_credentials', 'ensure_config_dir',
+    'flush_state', 'clear_state',
+    'ensure_config_dir',
     'get_aws_session', 'create_s3_bucket', 'delete_s3_bucket',
     'verify_aws_credentials',
     'clone_repository', 'detect_framework', 'build_project',
     'display_resources', 'get_resources_summary'
 ]
+
+def __getattr__(name):
+    """Import an exported name from its submodule on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __package__), name)
+    globals()[name] = value
+    return value
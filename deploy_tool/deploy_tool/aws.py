@@ -2,12 +2,45 @@
 AWS operations for deploy-tool.
 """
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import click
+import functools
 import json
+import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .config import save_state, load_state
 
+# Shared botocore configuration: keep connections alive and allow enough
+# pooled connections for concurrent uploads
+_BOTO_CFG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'standard', 'max_attempts': 5}
+)
+
+# S3 bucket names: 3-63 lowercase letters, digits, dots and hyphens,
+# starting and ending with a letter or digit
+BUCKET_NAME_RE = re.compile(r'^[a-z0-9][a-z0-9.-]{1,61}[a-z0-9]$')
+
+# Public read bucket policy, serialized once; formatted with the bucket name
+PUBLIC_READ_POLICY = json.dumps({
+    'Version': '2012-10-17',
+    'Statement': [{
+        'Sid': 'PublicReadGetObject',
+        'Effect': 'Allow',
+        'Principal': '*',
+        'Action': ['s3:GetObject'],
+        'Resource': 'arn:aws:s3:::%s/*'
+    }]
+})
+
+# DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+DELETE_WORKERS = 16
+
+@functools.lru_cache(maxsize=1)
 def get_aws_session():
     """Get an authenticated AWS session using the default credential provider chain.
     
@@ -16,6 +49,9 @@ def get_aws_session():
     - AWS config files
     - IAM roles
     - SSO tokens
+
+    The session is created once per process, so the credential provider
+    chain is only resolved on first use.
     """
     try:
         # Create a session using default credential provider chain
@@ -27,8 +63,11 @@ def get_aws_session():
         click.echo(f"Error getting AWS session: {e}", err=True)
         return None
 
+@functools.lru_cache(maxsize=None)
 def get_aws_client(service_name):
     """Get an AWS client for the specified service.
+
+    Clients are cached per service name and shared for the lifetime of the process.
     
     Args:
         service_name (str): The AWS service name (e.g., 's3', 'cloudfront')
@@ -40,11 +79,20 @@ def get_aws_client(service_name):
     if not session:
         return None
         
-    return session.client(service_name)
+    return session.client(service_name, config=_BOTO_CFG)
 
+def _reset_aws_caches():
+    """Clear the cached session, clients and credential check."""
+    verify_aws_credentials.cache_clear()
+    get_aws_client.cache_clear()
+    get_aws_session.cache_clear()
+
+@functools.lru_cache(maxsize=1)
 def verify_aws_credentials():
     """Verify that the AWS credentials are valid.
     
+    The STS check runs once per process; later calls return the cached result.
+    
     Returns:
         tuple: (is_valid, error_message)
     """
@@ -62,12 +110,20 @@ def verify_aws_credentials():
     except Exception as e:
         return False, f"AWS credentials invalid: {str(e)}"
 
+def _validate_bucket_name(bucket_name):
+    """Check that a bucket name follows the S3 naming rules."""
+    return BUCKET_NAME_RE.match(bucket_name) is not None
+
 def create_s3_bucket(bucket_name=None):
     """Create an S3 bucket for static site hosting."""
     # Generate a unique bucket name if not provided
     if not bucket_name:
         bucket_name = f"static-site-{uuid.uuid4().hex[:8]}"
     
+    if not _validate_bucket_name(bucket_name):
+        click.echo(f"Error: '{bucket_name}' is not a valid S3 bucket name.", err=True)
+        return False
+    
     # Get S3 client
     s3 = get_aws_client('s3')
     if not s3:
@@ -112,19 +168,9 @@ def create_s3_bucket(bucket_name=None):
         
         # Set bucket policy to allow public access
         try:
-            bucket_policy = {
-                'Version': '2012-10-17',
-                'Statement': [{
-                    'Sid': 'PublicReadGetObject',
-                    'Effect': 'Allow',
-                    'Principal': '*',
-                    'Action': ['s3:GetObject'],
-                    'Resource': f'arn:aws:s3:::{bucket_name}/*'
-                }]
-            }
             s3.put_bucket_policy(
                 Bucket=bucket_name,
-                Policy=json.dumps(bucket_policy)
+                Policy=PUBLIC_READ_POLICY % bucket_name
             )
         except ClientError as e:
             click.echo(f"Warning: Couldn't set bucket policy: {e}", err=True)
@@ -157,6 +203,63 @@ def create_s3_bucket(bucket_name=None):
         
         return False
 
+def get_object_etags(bucket_name):
+    """Get the ETag of every object in a bucket.
+    
+    If the bucket cannot be listed (for example without s3:ListBucket
+    permission), a warning is shown and an empty dict is returned, so
+    every file is uploaded.
+    
+    Returns:
+        dict: ETags without surrounding quotes, keyed by object key
+    """
+    s3 = get_aws_client('s3')
+    if not s3:
+        click.echo("Warning: Failed to get AWS S3 client; uploading all files.", err=True)
+        return {}
+    
+    etags = {}
+    try:
+        for page in s3.get_paginator('list_objects_v2').paginate(Bucket=bucket_name):
+            for obj in page.get('Contents', []):
+                etags[obj['Key']] = obj['ETag'].strip('"')
+    except ClientError as e:
+        click.echo(f"Warning: Couldn't list bucket contents ({e}); uploading all files.", err=True)
+        return {}
+    return etags
+
+def _iter_object_batches(s3, bucket_name):
+    """Yield lists of object identifiers to delete, at most DELETE_BATCH_SIZE each."""
+    versioning = s3.get_bucket_versioning(Bucket=bucket_name)
+    if 'Status' in versioning:
+        pages = s3.get_paginator('list_object_versions').paginate(Bucket=bucket_name)
+    else:
+        pages = s3.get_paginator('list_objects_v2').paginate(Bucket=bucket_name)
+    
+    for page in pages:
+        objects = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+        objects += [
+            {'Key': obj['Key'], 'VersionId': obj['VersionId']}
+            for obj in page.get('Versions', []) + page.get('DeleteMarkers', [])
+        ]
+        for i in range(0, len(objects), DELETE_BATCH_SIZE):
+            yield objects[i:i + DELETE_BATCH_SIZE]
+
+def _delete_object_batch(s3, bucket_name, objects):
+    """Delete a batch of objects with a single DeleteObjects call.
+    
+    Returns:
+        int: The number of objects that could not be deleted
+    """
+    response = s3.delete_objects(
+        Bucket=bucket_name,
+        Delete={'Objects': objects, 'Quiet': True}
+    )
+    errors = response.get('Errors', [])
+    for error in errors:
+        click.echo(f"Warning: Couldn't delete {error['Key']}: {error['Message']}", err=True)
+    return len(errors)
+
 def delete_s3_bucket(bucket_name):
     """Delete an S3 bucket."""
     # Get S3 client
@@ -166,10 +269,19 @@ def delete_s3_bucket(bucket_name):
         return False
     
     try:
-        # First delete all objects
-        session = get_aws_session()
-        bucket = session.resource('s3').Bucket(bucket_name)
-        bucket.objects.all().delete()
+        # First delete all objects (and all versions, if versioning was ever enabled)
+        failed = 0
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            futures = [
+                executor.submit(_delete_object_batch, s3, bucket_name, batch)
+                for batch in _iter_object_batches(s3, bucket_name)
+            ]
+            for future in as_completed(futures):
+                failed += future.result()
+        
+        if failed:
+            click.echo(f"Error deleting S3 bucket: {failed} object(s) could not be deleted", err=True)
+            return False
         
         # Then delete the bucket
         s3.delete_bucket(Bucket=bucket_name)
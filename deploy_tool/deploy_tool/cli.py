@@ -4,16 +4,320 @@ Main CLI module for deploy-tool.
 """
 
 import click
+import gzip
+import hashlib
+import importlib.util
+import io
+import mimetypes
+import re
 import sys
 import os
 import uuid
 from pathlib import Path
-import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .config import load_state, save_state
-from .aws import create_s3_bucket, delete_s3_bucket, get_aws_session, verify_aws_credentials, get_aws_client
-from .github import clone_repository, detect_framework, build_project
-from .resources import display_resources
+from .config import load_state, save_state, clear_state
+
+# Register types that platform MIME databases often get wrong or lack
+mimetypes.init()
+mimetypes.add_type('text/css', '.css')
+mimetypes.add_type('application/javascript', '.js')
+mimetypes.add_type('application/javascript', '.mjs')
+mimetypes.add_type('application/json', '.map')
+mimetypes.add_type('application/wasm', '.wasm')
+mimetypes.add_type('image/svg+xml', '.svg')
+mimetypes.add_type('image/webp', '.webp')
+mimetypes.add_type('image/avif', '.avif')
+mimetypes.add_type('font/woff', '.woff')
+mimetypes.add_type('font/woff2', '.woff2')
+
+# Cache-Control header for uploaded files, by extension
+CACHE_CONTROL = {
+    '.html': 'no-cache, no-store, must-revalidate',  # Prevent caching for HTML files
+    '.css': 'max-age=31536000',  # 1 year for static assets
+    '.js': 'max-age=31536000',
+    '.png': 'max-age=31536000',  # 1 year for images
+    '.jpg': 'max-age=31536000',
+    '.jpeg': 'max-age=31536000',
+    '.gif': 'max-age=31536000',
+    '.webp': 'max-age=31536000',
+    '.avif': 'max-age=31536000',
+    '.woff': 'max-age=31536000',  # 1 year for fonts
+    '.woff2': 'max-age=31536000',
+    '.eot': 'max-age=31536000',
+    '.ttf': 'max-age=31536000',
+    '.otf': 'max-age=31536000',
+}
+DEFAULT_CACHE_CONTROL = 'max-age=86400'  # Default cache of 1 day
+
+# Bundlers put a content hash in asset names (e.g. main.3f2a9c1d.js), so those
+# files never change and can be cached forever. The hash must contain a letter,
+# so date stamps and numeric IDs (report-20240101.pdf) are not mistaken for one.
+HASHED_NAME_RE = re.compile(r'[.-](?=[0-9]*[a-f])[0-9a-f]{8,}\.')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Text assets larger than GZIP_MIN_SIZE bytes are stored gzip-compressed
+GZIP_EXTENSIONS = frozenset(['.html', '.css', '.js', '.mjs', '.json', '.svg', '.xml', '.txt', '.map'])
+GZIP_MIN_SIZE = 1024
+
+# Files larger than this are streamed from disk rather than read into memory
+STREAM_THRESHOLD = 16 * 1024 * 1024
+
+# Number of concurrent S3 uploads during deploy
+UPLOAD_WORKERS = 20
+
+# Number of buckets deleted concurrently during rollback
+ROLLBACK_WORKERS = 8
+
+# Number of in-flight S3 requests when uploading with --async
+ASYNC_UPLOAD_LIMIT = 64
+
+def _walk_files(root):
+    """Yield a DirEntry for every file below root."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+def _collect_uploads(build_dir, cache_control, compress=True):
+    """Collect the files to upload from a build directory.
+    
+    Args:
+        build_dir (str): The build output directory
+        cache_control (dict): Cache-Control values keyed by extension
+        compress (bool): Whether to gzip text assets larger than GZIP_MIN_SIZE
+        
+    Returns:
+        list: (local_path, key, extra_args) tuples
+    """
+    build_dir = os.path.normpath(build_dir)
+    prefix_len = len(build_dir) + 1
+    uploads = []
+    for entry in _walk_files(build_dir):
+        local_path = entry.path
+        key = local_path[prefix_len:].replace(os.sep, '/')
+        content_type, _ = mimetypes.guess_type(entry.name)
+        ext = os.path.splitext(entry.name)[1].lower()
+        if ext != '.html' and HASHED_NAME_RE.search(entry.name):
+            file_cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            file_cache_control = cache_control.get(ext, DEFAULT_CACHE_CONTROL)
+        extra_args = {
+            'ContentType': content_type or 'application/octet-stream',
+            'CacheControl': file_cache_control
+        }
+        if compress and ext in GZIP_EXTENSIONS and entry.stat().st_size > GZIP_MIN_SIZE:
+            extra_args['ContentEncoding'] = 'gzip'
+        uploads.append((local_path, key, extra_args))
+    return uploads
+
+def _file_md5(path):
+    """Return the hex MD5 digest of a file, read in chunks."""
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+def _gzip_bytes(data):
+    """Return gzip-compressed data.
+    
+    The gzip header timestamp is fixed so identical files compress to
+    identical bytes, which keeps the ETag comparison for unchanged files working.
+    """
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6, mtime=0) as f:
+        f.write(data)
+    return buf.getvalue()
+
+def _read_upload_body(local_path, extra_args):
+    """Read a file as it will be stored in S3, gzip-compressed if marked so.
+    
+    Returns:
+        tuple: (body, md5_hex_digest)
+    """
+    with open(local_path, 'rb') as f:
+        body = f.read()
+    if extra_args.get('ContentEncoding') == 'gzip':
+        body = _gzip_bytes(body)
+    return body, hashlib.md5(body).hexdigest()
+
+def _upload_file(s3_client, transfer, bucket_name, local_path, key, extra_args, existing_etag):
+    """Upload a single file unless S3 already holds identical content.
+    
+    Files are read once and sent with put_object. Files larger than
+    STREAM_THRESHOLD that are not gzip-compressed are streamed through the
+    transfer manager instead, to bound memory use.
+    
+    Returns:
+        bool: True if the file was uploaded, False if it was unchanged
+    """
+    if 'ContentEncoding' not in extra_args and os.path.getsize(local_path) > STREAM_THRESHOLD:
+        digest = _file_md5(local_path)
+        if existing_etag == digest:
+            return False
+        if existing_etag and '-' in existing_etag:
+            # Multipart ETags are not an MD5 of the content; compare the digest we stored instead
+            head = s3_client.head_object(Bucket=bucket_name, Key=key)
+            if head.get('Metadata', {}).get('md5') == digest:
+                return False
+        
+        # Record the digest so it survives multipart uploads, whose ETag is not an MD5
+        extra_args = dict(extra_args, Metadata={'md5': digest})
+        transfer.upload(local_path, bucket_name, key, extra_args=extra_args).result()
+        return True
+    
+    body, digest = _read_upload_body(local_path, extra_args)
+    if existing_etag == digest:
+        return False
+    s3_client.put_object(Bucket=bucket_name, Key=key, Body=body, Metadata={'md5': digest}, **extra_args)
+    return True
+
+def _report_uploads(results, total, verbose=False):
+    """Show upload progress followed by any errors and a summary.
+    
+    Args:
+        results: (key, extra_args, outcome) tuples, where outcome is True for an
+            uploaded file, False for an unchanged one, or the raised exception
+        total (int): The number of files being uploaded
+        verbose (bool): Echo every uploaded file instead of drawing a progress bar
+        
+    Returns:
+        int: The number of files that failed to upload
+    """
+    uploaded = skipped = 0
+    errors = []
+    
+    def consume(advance):
+        nonlocal uploaded, skipped
+        for key, extra_args, outcome in results:
+            if isinstance(outcome, BaseException):
+                errors.append((key, outcome))
+            elif outcome:
+                uploaded += 1
+                if verbose:
+                    click.echo(f"Uploaded: {key} [{extra_args['ContentType']}]")
+            else:
+                skipped += 1
+            advance(1)
+    
+    if verbose:
+        consume(lambda n: None)
+    else:
+        with click.progressbar(length=total, label="Uploading files") as bar:
+            consume(bar.update)
+    
+    for key, error in errors:
+        click.echo(f"Error uploading {key}: {error}", err=True)
+    click.echo(f"Uploaded {uploaded} file(s), skipped {skipped} unchanged file(s).")
+    return len(errors)
+
+def _upload_files(s3_client, transfer, bucket_name, uploads, existing_etags, verbose=False):
+    """Upload files to an S3 bucket concurrently, skipping unchanged files.
+    
+    Args:
+        s3_client: The S3 client, shared across worker threads
+        transfer (TransferManager): The transfer manager, shared across worker threads
+        bucket_name (str): The destination bucket
+        uploads (list): (local_path, key, extra_args) tuples
+        existing_etags (dict): ETags of the objects already in the bucket, keyed by key
+        verbose (bool): Echo every uploaded file instead of drawing a progress bar
+        
+    Returns:
+        int: The number of files that failed to upload
+    """
+    def results(futures):
+        for future in as_completed(futures):
+            key, extra_args = futures[future]
+            try:
+                yield key, extra_args, future.result()
+            except Exception as e:
+                yield key, extra_args, e
+    
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                _upload_file, s3_client, transfer, bucket_name, local_path, key, extra_args,
+                existing_etags.get(key)
+            ): (key, extra_args)
+            for local_path, key, extra_args in uploads
+        }
+        return _report_uploads(results(futures), len(uploads), verbose)
+
+async def _upload_file_async(s3, bucket_name, local_path, key, extra_args, existing_etag):
+    """Upload a single file with an aioboto3 client unless S3 already holds identical content.
+    
+    The asyncio counterpart of _upload_file: files are read and hashed in
+    the default executor so the event loop is not blocked, and large
+    uncompressed files are streamed with upload_fileobj.
+    
+    Returns:
+        bool: True if the file was uploaded, False if it was unchanged
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    
+    if 'ContentEncoding' not in extra_args and os.path.getsize(local_path) > STREAM_THRESHOLD:
+        digest = await loop.run_in_executor(None, _file_md5, local_path)
+        if existing_etag == digest:
+            return False
+        if existing_etag and '-' in existing_etag:
+            # Multipart ETags are not an MD5 of the content; compare the digest we stored instead
+            head = await s3.head_object(Bucket=bucket_name, Key=key)
+            if head.get('Metadata', {}).get('md5') == digest:
+                return False
+        
+        extra_args = dict(extra_args, Metadata={'md5': digest})
+        with open(local_path, 'rb') as f:
+            await s3.upload_fileobj(f, bucket_name, key, ExtraArgs=extra_args)
+        return True
+    
+    body, digest = await loop.run_in_executor(None, _read_upload_body, local_path, extra_args)
+    if existing_etag == digest:
+        return False
+    await s3.put_object(Bucket=bucket_name, Key=key, Body=body, Metadata={'md5': digest}, **extra_args)
+    return True
+
+async def _upload_files_async(region, bucket_name, uploads, existing_etags, verbose=False):
+    """Upload files to an S3 bucket with aioboto3, skipping unchanged files.
+    
+    Args:
+        region (str): The AWS region of the bucket
+        bucket_name (str): The destination bucket
+        uploads (list): (local_path, key, extra_args) tuples
+        existing_etags (dict): ETags of the objects already in the bucket, keyed by key
+        verbose (bool): Echo every uploaded file instead of drawing a progress bar
+        
+    Returns:
+        int: The number of files that failed to upload
+    """
+    import asyncio
+    import aioboto3
+    from aiobotocore.config import AioConfig
+    
+    semaphore = asyncio.Semaphore(ASYNC_UPLOAD_LIMIT)
+    session = aioboto3.Session(region_name=region)
+    config = AioConfig(max_pool_connections=ASYNC_UPLOAD_LIMIT)
+    
+    async with session.client('s3', config=config) as s3:
+        async def upload(local_path, key, extra_args):
+            async with semaphore:
+                return await _upload_file_async(s3, bucket_name, local_path, key, extra_args, existing_etags.get(key))
+        
+        outcomes = await asyncio.gather(
+            *[upload(*item) for item in uploads],
+            return_exceptions=True
+        )
+    
+    return _report_uploads(
+        ((key, extra_args, outcome) for (_, key, extra_args), outcome in zip(uploads, outcomes)),
+        len(uploads),
+        verbose
+    )
 
 @click.group()
 @click.version_option()
@@ -24,6 +328,8 @@ def cli():
 @cli.command()
 def verify():
     """Verify the AWS configuration."""
+    from .aws import verify_aws_credentials
+    
     click.echo("Verifying AWS credentials...")
     
     # Check AWS credentials
@@ -49,9 +355,11 @@ def verify():
     else:
         click.echo("\nNo resources have been created yet.")
 
-@cli.command()
-def list():
+@cli.command(name='list')
+def list_resources():
     """List all resources created by deploy-tool."""
+    from .resources import display_resources
+    
     click.echo("Listing resources created by deploy-tool...")
     display_resources()
 
@@ -59,6 +367,8 @@ def list():
 @cli.command()
 def init():
     """Initialize AWS infrastructure."""
+    from .aws import create_s3_bucket, verify_aws_credentials
+    
     click.echo("Initializing AWS infrastructure...")
     
     # Verify AWS credentials are available
@@ -88,11 +398,24 @@ def init():
 @cli.command()
 @click.argument('github_url')
 @click.option('--debug', is_flag=True, help="Show additional debug information during deployment")
-def deploy(github_url, debug):
+@click.option('--force', is_flag=True, help="Upload every file, even if it is unchanged in S3")
+@click.option('--no-gzip', is_flag=True, help="Upload text assets without gzip compression")
+@click.option('--async', 'use_async', is_flag=True, help="Upload with asyncio and aioboto3 instead of threads")
+def deploy(github_url, debug, force, no_gzip, use_async):
     """Deploy a static site from GitHub to AWS.
     
     GITHUB_URL is the URL of the GitHub repository to deploy.
     """
+    # boto3 and gitpython are slow to import, so only load them when deploying
+    from boto3.s3.transfer import TransferConfig
+    from s3transfer.manager import TransferManager
+    from .aws import get_aws_client, get_object_etags, verify_aws_credentials
+    from .github import (
+        clone_repository, fetch_repository_tarball, detect_framework, build_project,
+        get_remote_commit, get_head_commit, get_cached_build, cache_build,
+        clear_json_cache, remove_tree
+    )
+    
     click.echo(f"Deploying static site from {github_url}...")
     
     # Verify AWS credentials
@@ -104,7 +427,7 @@ def deploy(github_url, debug):
     
     # Get state to find the bucket
     state = load_state()
-    buckets = [r['name'] for r in state.get('resources', []) if r['type'] == 's3_bucket']
+    buckets = state['by_type'].get('s3_bucket', [])
     
     if not buckets:
         click.echo("No S3 bucket found. Please run 'deploy-tool init' first.")
@@ -112,33 +435,41 @@ def deploy(github_url, debug):
     
     bucket_name = buckets[0]  # Use the first bucket
     
-    # Clone the repository
-    repo_path, repo_name = clone_repository(github_url)
-    if not repo_path:
-        return
+    # Reuse an earlier build if the repository's HEAD commit has not changed
+    commit = get_remote_commit(github_url)
+    build_dir, framework = get_cached_build(commit) if commit else (None, None)
+    repo_path = None
     
     try:
-        # Detect the framework
-        framework = detect_framework(repo_path)
-        if framework == 'unknown':
-            click.echo("Could not detect a supported framework (React, Next.js, Angular).")
-            return
-        
-        click.echo(f"Detected framework: {framework}")
-        
-        # Build the project
-        build_dir = build_project(repo_path, framework)
-        if not build_dir:
-            return
+        if build_dir:
+            click.echo(f"Using cached {framework} build of commit {commit[:7]}")
+        else:
+            # Download the repository, falling back to a git clone
+            repo_path, repo_name = fetch_repository_tarball(github_url, commit)
+            if not repo_path:
+                repo_path, repo_name = clone_repository(github_url)
+            if not repo_path:
+                return
+            commit = get_head_commit(repo_path) or commit
+            
+            # Detect the framework
+            framework = detect_framework(repo_path)
+            if framework == 'unknown':
+                click.echo("Could not detect a supported framework (React, Next.js, Angular).")
+                return
+            
+            click.echo(f"Detected framework: {framework}")
+            
+            # Build the project
+            build_dir = build_project(repo_path, framework)
+            if not build_dir:
+                return
         
         # Deploy to S3
         click.echo(f"Deploying to S3 bucket: {bucket_name}...")
         
-        # Get S3 client and resource
-        session = get_aws_session()
+        # Get S3 client
         s3_client = get_aws_client('s3')
-        s3_resource = session.resource('s3')
-        bucket = s3_resource.Bucket(bucket_name)
         
         # Special handling for SPA frameworks (React, Angular, Next.js) to ensure proper routing
         if framework in ['react', 'angular', 'nextjs']:
@@ -154,17 +485,18 @@ def deploy(github_url, debug):
                         click.echo(f"  - {item}")
             else:
                 # Check if index.html is not empty and has actual content
-                with open(index_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    index_content = f.read()
-                    
-                if len(index_content) < 100:
+                index_size = os.path.getsize(index_path)
+                if index_size < 100:
                     click.echo("Warning: index.html seems unusually small!", err=True)
                 
                 if debug:
-                    click.echo(f"index.html size: {len(index_content)} bytes")
+                    click.echo(f"index.html size: {index_size} bytes")
+                    # Only inspect the start of the file, where the root div and scripts normally are
+                    with open(index_path, 'rb') as f:
+                        index_head = f.read(65536)
                     # Check for basic elements that should be in a properly built React app
-                    has_root_div = '<div id="root"' in index_content or '<div id="app"' in index_content
-                    has_js_imports = '.js"' in index_content
+                    has_root_div = b'<div id="root"' in index_head or b'<div id="app"' in index_head
+                    has_js_imports = b'.js"' in index_head
                     click.echo(f"index.html has root div: {has_root_div}")
                     click.echo(f"index.html has JS imports: {has_js_imports}")
             
@@ -175,71 +507,41 @@ def deploy(github_url, debug):
                 for js_file in js_files[:5]:  # Show up to 5 files
                     click.echo(f"  - {js_file}")
             
-            # Ensure proper MIME types and caching for React apps
-            for root, _, files in os.walk(build_dir):
-                for file in files:
-                    local_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(local_path, build_dir)
-                    
-                    # Determine content type with better MIME type handling
-                    content_type = 'text/plain'
-                    cache_control = 'max-age=86400'  # Default cache of 1 day
-                    
-                    if file.endswith('.html'):
-                        content_type = 'text/html'
-                        cache_control = 'no-cache, no-store, must-revalidate'  # Prevent caching for HTML files
-                    elif file.endswith('.css'):
-                        content_type = 'text/css'
-                        cache_control = 'max-age=31536000'  # 1 year for static assets
-                    elif file.endswith('.js'):
-                        content_type = 'application/javascript'
-                        cache_control = 'max-age=31536000'  # 1 year for static assets
-                    elif file.endswith('.json'):
-                        content_type = 'application/json'
-                    elif file.endswith('.svg'):
-                        content_type = 'image/svg+xml'
-                    elif file.endswith(('.png', '.jpg', '.jpeg', '.gif')):
-                        file_ext = file.split(".")[-1]
-                        content_type = f'image/{file_ext.lower()}'
-                        cache_control = 'max-age=31536000'  # 1 year for images
-                    elif file.endswith(('.woff', '.woff2', '.eot', '.ttf', '.otf')):
-                        file_ext = file.split(".")[-1]
-                        content_type = f'font/{file_ext.lower()}'
-                        cache_control = 'max-age=31536000'  # 1 year for fonts
-                    
-                    click.echo(f"Uploading: {relative_path} [{content_type}]")
-                    bucket.upload_file(
-                        local_path, 
-                        relative_path,
-                        ExtraArgs={
-                            'ContentType': content_type,
-                            'CacheControl': cache_control
-                        }
-                    )
+        # List the bucket in the background while walking the build directory
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            etags_future = None if force else executor.submit(get_object_etags, bucket_name)
+            
+            # Ensure proper MIME types and caching for every file in the build
+            uploads = _collect_uploads(build_dir, CACHE_CONTROL, compress=not no_gzip)
+            
+            existing_etags = etags_future.result() if etags_future else {}
+        
+        # Upload all files concurrently, skipping files whose content is already in S3
+        if use_async and importlib.util.find_spec('aioboto3') is None:
+            click.echo("Warning: --async requires aioboto3 (pip install aioboto3); using threads instead.", err=True)
+            use_async = False
+        
+        if use_async:
+            region = s3_client.meta.region_name
+            import asyncio
+            failed = asyncio.run(_upload_files_async(region, bucket_name, uploads, existing_etags, debug))
         else:
-            # Standard file upload for other frameworks
-            for root, _, files in os.walk(build_dir):
-                for file in files:
-                    local_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(local_path, build_dir)
-                    
-                    # Determine content type
-                    content_type = 'text/html'
-                    if file.endswith('.css'):
-                        content_type = 'text/css'
-                    elif file.endswith('.js'):
-                        content_type = 'application/javascript'
-                    elif file.endswith('.json'):
-                        content_type = 'application/json'
-                    elif file.endswith(('.png', '.jpg', '.jpeg', '.gif')):
-                        content_type = f'image/{file.split(".")[-1]}'
-                    
-                    click.echo(f"Uploading: {relative_path}")
-                    bucket.upload_file(
-                        local_path, 
-                        relative_path,
-                        ExtraArgs={'ContentType': content_type}
-                    )
+            # One transfer manager is shared by all uploads and shut down once they finish
+            transfer_config = TransferConfig(
+                max_concurrency=UPLOAD_WORKERS,
+                multipart_threshold=8 * 1024 * 1024,
+                use_threads=True
+            )
+            with TransferManager(s3_client, transfer_config) as transfer:
+                failed = _upload_files(s3_client, transfer, bucket_name, uploads, existing_etags, debug)
+        if failed:
+            click.echo(f"Deployment failed: {failed} file(s) could not be uploaded.", err=True)
+            return
+        
+        # Keep the build so redeploying this commit can skip clone and build.
+        # A build directory that is the repository root is not worth copying.
+        if repo_path and commit and build_dir != repo_path:
+            cache_build(build_dir, framework, github_url, commit)
         
         # Output the URL - using ap-south-1 region
         region = 'ap-south-1'
@@ -249,16 +551,15 @@ def deploy(github_url, debug):
         click.echo(f"Your site is available at: {url}")
     
     finally:
+        clear_json_cache()
+        
         # Clean up temp directory
         if repo_path and os.path.exists(repo_path):
-            try:
-                # Try normal cleanup
-                shutil.rmtree(repo_path)
-            except (PermissionError, OSError) as e:
-                # Handle Windows file lock issues
-                click.echo(f"Warning: Could not fully clean up temporary files: {e}", err=True)
+            # Read-only git pack files are made writable; locked files are left behind
+            remove_tree(repo_path)
+            if os.path.exists(repo_path):
+                click.echo("Warning: Could not fully clean up temporary files.", err=True)
                 click.echo("Some temporary files may remain in your temp directory.")
-                # Continue execution despite cleanup failure
 
 
 @cli.command()
@@ -266,6 +567,8 @@ def deploy(github_url, debug):
     prompt="Are you sure you want to destroy all AWS infrastructure created by deploy-tool?")
 def rollback():
     """Destroy all AWS infrastructure created by deploy-tool."""
+    from .aws import delete_s3_bucket, get_aws_client, verify_aws_credentials
+    
     click.echo("Rolling back AWS infrastructure...")
     
     # Verify AWS credentials
@@ -283,17 +586,31 @@ def rollback():
         click.echo("No resources found to delete.")
         return
     
-    # Delete resources
-    for resource in resources:
-        if resource['type'] == 's3_bucket':
-            click.echo(f"Deleting S3 bucket: {resource['name']}...")
-            delete_s3_bucket(resource['name'])
+    # Delete buckets concurrently, keeping any that could not be deleted in the state
+    buckets = state['by_type'].get('s3_bucket', [])
+    for bucket_name in buckets:
+        click.echo(f"Deleting S3 bucket: {bucket_name}...")
+    
+    # Create the shared S3 client before starting the workers; boto3 sessions
+    # are not safe to build clients from on several threads at once
+    get_aws_client('s3')
+    
+    with ThreadPoolExecutor(max_workers=ROLLBACK_WORKERS) as executor:
+        results = list(executor.map(delete_s3_bucket, buckets))
+    deleted = {name for name, success in zip(buckets, results) if success}
+    
+    state['resources'] = [
+        r for r in resources
+        if not (r['type'] == 's3_bucket' and r['name'] in deleted)
+    ]
+    failed = sum(1 for r in state['resources'] if r['type'] == 's3_bucket')
+    if failed:
+        save_state(state)
+        click.echo(f"Rollback incomplete: {failed} S3 bucket(s) could not be deleted.", err=True)
+        return
     
     # Clear state file
-    from pathlib import Path
-    STATE_FILE = Path.home() / ".deploy-tool" / "state.json"
-    if STATE_FILE.exists():
-        STATE_FILE.unlink()
+    clear_state()
     
     click.echo("Rollback completed successfully.")
 
@@ -1,14 +1,49 @@
 """
 State management for deploy-tool.
 """
+import atexit
 import os
 import json
 import click
 from pathlib import Path
 
+# orjson is optional; it parses and serializes state much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration paths
 CONFIG_DIR = Path.home() / ".deploy-tool"
 STATE_FILE = CONFIG_DIR / "state.json"
+BUILD_CACHE_DIR = CONFIG_DIR / "build-cache"
+NPM_CACHE_DIR = CONFIG_DIR / "npm-cache"
+PNPM_STORE_DIR = CONFIG_DIR / "pnpm-store"
+
+# Parsed state, shared by every caller in this process, and the
+# modification time of the state file it was read from
+_state_cache = None
+_state_dirty = False
+_state_mtime = None
+
+def _json_loads(data):
+    """Parse JSON from bytes, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj):
+    """Serialize an object to indented JSON bytes, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+def _index_resources(state):
+    """Rebuild the state's resource names by type index."""
+    by_type = {}
+    for resource in state.get('resources', []):
+        by_type.setdefault(resource['type'], []).append(resource['name'])
+    state['by_type'] = by_type
 
 def ensure_config_dir():
     """Ensure the config directory exists."""
@@ -16,14 +51,54 @@ def ensure_config_dir():
 
 def save_state(state):
     """Save the state to file."""
-    ensure_config_dir()
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+    global _state_cache, _state_dirty
+    _state_cache = state
+    _state_dirty = True
+    flush_state()
 
 def load_state():
-    """Load the state from file."""
-    if not STATE_FILE.exists():
-        return {"resources": []}
+    """Load the state, re-reading the state file only if it changed on disk."""
+    global _state_cache, _state_mtime
+    if _state_dirty:
+        return _state_cache
+    
+    try:
+        mtime = STATE_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
     
-    with open(STATE_FILE, 'r') as f:
-        return json.load(f)
+    if _state_cache is None or mtime != _state_mtime:
+        if mtime is None:
+            _state_cache = {"resources": []}
+        else:
+            _state_cache = _json_loads(STATE_FILE.read_bytes())
+        # Rebuild rather than trust a stored index; other writers may not maintain it
+        _index_resources(_state_cache)
+        _state_mtime = mtime
+    
+    return _state_cache
+
+def flush_state():
+    """Write unsaved state to file atomically."""
+    global _state_dirty, _state_mtime
+    if _state_cache is None or not _state_dirty:
+        return
+    
+    _index_resources(_state_cache)
+    ensure_config_dir()
+    tmp_file = STATE_FILE.with_suffix('.json.tmp')
+    tmp_file.write_bytes(_json_dumps(_state_cache))
+    os.replace(tmp_file, STATE_FILE)
+    _state_mtime = STATE_FILE.stat().st_mtime_ns
+    _state_dirty = False
+
+def clear_state():
+    """Forget all state and remove the state file."""
+    global _state_cache, _state_dirty, _state_mtime
+    _state_cache = None
+    _state_dirty = False
+    _state_mtime = None
+    if STATE_FILE.exists():
+        STATE_FILE.unlink()
+
+atexit.register(flush_state)
@@ -2,26 +2,175 @@
 GitHub operations for deploy-tool.
 """
 import os
+import re
 import shutil
+import stat
+import subprocess
+import sys
+import tarfile
 import tempfile
 import json
 import click
-import git
+import time
+import urllib.request
 from pathlib import Path
+from .config import BUILD_CACHE_DIR, NPM_CACHE_DIR, PNPM_STORE_DIR, _json_loads
 
-def clone_repository(github_url):
+# Number of builds kept in the build cache
+BUILD_CACHE_SIZE = 5
+
+# Matches https://github.com/owner/repo(.git) and git@github.com:owner/repo(.git)
+GITHUB_URL_RE = re.compile(r'^(?:https?://(?:www\.)?github\.com/|git@github\.com:)([^/]+)/([^/]+?)(?:\.git)?/?$')
+
+# Parsed JSON files (package.json, angular.json), keyed by absolute path
+_json_cache = {}
+
+def _load_json(path):
+    """Parse a JSON file, reusing the previous result if the file is unchanged."""
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    data = _json_loads(Path(path).read_bytes())
+    _json_cache[path] = (mtime, data)
+    return data
+
+def clear_json_cache():
+    """Forget all cached JSON parse results."""
+    _json_cache.clear()
+
+# Keep npm quiet and non-interactive: no progress bar, audit or funding requests.
+# Packages are cached outside the temporary checkout so later installs reuse them.
+NPM_ENV = {
+    "npm_config_cache": str(NPM_CACHE_DIR),
+    "npm_config_progress": "false",
+    "npm_config_audit": "false",
+    "npm_config_fund": "false",
+}
+
+# Install command per lockfile, in order of preference
+NPM_CI_COMMAND = ['npm', 'ci', '--prefer-offline', '--no-audit', '--no-fund']
+NPM_INSTALL_COMMAND = ['npm', 'install', '--no-audit', '--no-fund']
+INSTALL_COMMANDS = [
+    ('package-lock.json', NPM_CI_COMMAND),
+    ('pnpm-lock.yaml', ['pnpm', 'install', '--frozen-lockfile', f'--store-dir={PNPM_STORE_DIR}']),
+    ('yarn.lock', ['yarn', 'install', '--frozen-lockfile']),
+]
+
+def _install_command(repo_path):
+    """Pick the dependency install command based on the lockfile in the repository.
+    
+    yarn and pnpm are only used if they are installed; otherwise npm install is used.
+    """
+    with os.scandir(repo_path) as it:
+        names = {entry.name for entry in it}
+    
+    for lockfile, command in INSTALL_COMMANDS:
+        if lockfile in names and shutil.which(command[0]):
+            return command
+    return NPM_INSTALL_COMMAND
+
+def _run(args, repo_path, check=True):
+    """Run a command in the repository without going through a shell.
+    
+    Returns:
+        int: The command's exit code
+    
+    Raises:
+        subprocess.CalledProcessError: If check is set and the command fails
+    """
+    # Resolve the executable explicitly so npm.cmd is found on Windows
+    args = [shutil.which(args[0]) or args[0], *args[1:]]
+    return subprocess.run(args, cwd=repo_path, env={**os.environ, **NPM_ENV}, check=check).returncode
+
+def _remove_readonly(func, path, exc):
+    """rmtree error handler: clear the read-only flag (set on git pack files on Windows) and retry."""
+    try:
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+    except OSError:
+        pass
+
+def remove_tree(path):
+    """Delete a directory tree, ignoring files that cannot be removed."""
+    # onerror is deprecated from Python 3.12 in favour of onexc
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_remove_readonly)
+    else:
+        shutil.rmtree(path, onerror=_remove_readonly)
+
+def fetch_repository_tarball(github_url, ref=None):
+    """Download a GitHub repository's files as a tarball, without git metadata.
+    
+    Args:
+        github_url (str): The repository URL
+        ref (str): The commit, branch or tag to download; defaults to HEAD
+        
+    Returns:
+        tuple: (repo_path, repo_name) if successful, (None, None) otherwise,
+        e.g. for private repositories or URLs that are not on GitHub
+    """
+    match = GITHUB_URL_RE.match(github_url)
+    if not match:
+        return None, None
+    owner, repo_name = match.groups()
+    
+    temp_dir = tempfile.mkdtemp(prefix="deploy-tool-")
+    url = f"https://codeload.github.com/{owner}/{repo_name}/tar.gz/{ref or 'HEAD'}"
+    try:
+        click.echo(f"Downloading repository archive from {url}...")
+        with urllib.request.urlopen(url, timeout=60) as response:
+            with tarfile.open(fileobj=response, mode="r|gz") as tar:
+                for member in tar:
+                    # Strip the top-level "<repo>-<ref>/" directory
+                    _, _, member.name = member.name.partition('/')
+                    if not member.name:
+                        continue
+                    if hasattr(tarfile, 'data_filter'):
+                        tar.extract(member, temp_dir, filter='data')
+                    elif not (os.path.isabs(member.name) or '..' in member.name.split('/')
+                              or member.issym() or member.islnk()):
+                        tar.extract(member, temp_dir)
+        
+        return temp_dir, repo_name
+    
+    except Exception as e:
+        click.echo(f"Could not download repository archive ({e}), falling back to git clone.")
+        remove_tree(temp_dir)
+        return None, None
+
+def clone_repository(github_url, depth=1, treeless=False):
     """Clone a GitHub repository to a temporary directory.
     
+    Only the working tree is needed to build, so by default just the tip commit
+    of the default branch is fetched.
+    
+    Args:
+        github_url (str): The repository URL
+        depth (int): Number of commits of history to fetch, or None for full history
+        treeless (bool): Fetch history but download file contents only when needed
+        
     Returns:
         tuple: (repo_path, repo_name) if successful, (None, None) otherwise
     """
+    multi_options = []
+    if depth:
+        multi_options += [f"--depth={depth}", "--single-branch", "--no-tags"]
+    if treeless:
+        multi_options.append("--filter=blob:none")
+    
+    import git
+    
+    temp_dir = None
     try:
         # Create a temporary directory
         temp_dir = tempfile.mkdtemp(prefix="deploy-tool-")
         
         # Clone the repository
         click.echo(f"Cloning repository from {github_url}...")
-        git.Repo.clone_from(github_url, temp_dir)
+        git.Repo.clone_from(github_url, temp_dir, multi_options=multi_options)
         
         # Get the repository name from the URL
         repo_name = github_url.rstrip('/').split('/')[-1]
@@ -32,9 +181,89 @@ def clone_repository(github_url):
     
     except Exception as e:
         click.echo(f"Error cloning repository: {e}", err=True)
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
+        if temp_dir:
+            remove_tree(temp_dir)
+        return None, None
+
+def get_remote_commit(github_url):
+    """Get the commit the remote repository's HEAD points to, without cloning.
+    
+    Returns:
+        str: The commit SHA, or None if it could not be determined
+    """
+    try:
+        import git
+        output = git.cmd.Git().ls_remote(github_url, 'HEAD')
+        return output.split()[0] if output else None
+    except Exception:
+        return None
+
+def get_head_commit(repo_path):
+    """Get the commit checked out in a cloned repository.
+    
+    Returns:
+        str: The commit SHA, or None if it could not be determined
+    """
+    try:
+        import git
+        return git.Repo(repo_path).head.commit.hexsha
+    except Exception:
+        return None
+
+def get_cached_build(commit):
+    """Look up a cached build for a commit.
+    
+    Returns:
+        tuple: (build_dir, framework) if cached, (None, None) otherwise
+    """
+    entry_dir = BUILD_CACHE_DIR / commit
+    try:
+        with open(entry_dir / 'manifest.json', 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
         return None, None
+    
+    return str(entry_dir / 'site'), manifest['framework']
+
+def cache_build(build_dir, framework, github_url, commit):
+    """Copy a build directory into the build cache, keyed by commit."""
+    entry_dir = BUILD_CACHE_DIR / commit
+    if entry_dir.exists():
+        return
+    
+    tmp_dir = BUILD_CACHE_DIR / f"{commit}.tmp"
+    try:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        shutil.copytree(build_dir, tmp_dir / 'site', copy_function=shutil.copyfile)
+        with open(tmp_dir / 'manifest.json', 'w') as f:
+            json.dump({
+                'framework': framework,
+                'url': github_url,
+                'sha': commit,
+                'mtime': time.time()
+            }, f, indent=2)
+        os.replace(tmp_dir, entry_dir)
+    except OSError as e:
+        click.echo(f"Warning: Could not cache build: {e}", err=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return
+    
+    # Drop the oldest builds beyond BUILD_CACHE_SIZE
+    entries = sorted(
+        (d for d in BUILD_CACHE_DIR.iterdir() if (d / 'manifest.json').exists()),
+        key=lambda d: (d / 'manifest.json').stat().st_mtime,
+        reverse=True
+    )
+    for old_entry in entries[BUILD_CACHE_SIZE:]:
+        shutil.rmtree(old_entry, ignore_errors=True)
+
+# Frameworks and the packages that identify them, checked in order
+FRAMEWORK_RULES = [
+    ('nextjs', frozenset({'next'})),
+    ('react', frozenset({'react', 'react-dom'})),
+    ('angular', frozenset({'@angular/core'})),
+]
 
 def detect_framework(repo_path):
     """Detect the framework used in the repository.
@@ -49,77 +278,132 @@ def detect_framework(repo_path):
         return 'unknown'
     
     try:
-        with open(package_json_path, 'r') as f:
-            package_json = json.load(f)
+        package_json = _load_json(package_json_path)
         
-        dependencies = {**package_json.get('dependencies', {}), **package_json.get('devDependencies', {})}
+        dependencies = frozenset(package_json.get('dependencies', {})).union(
+            package_json.get('devDependencies', {}))
         
-        if 'next' in dependencies:
-            return 'nextjs'
-        elif 'react' in dependencies and 'react-dom' in dependencies:
-            return 'react'
-        elif '@angular/core' in dependencies:
-            return 'angular'
-        else:
-            click.echo("Could not determine framework from package.json.")
-            return 'unknown'
+        for framework, markers in FRAMEWORK_RULES:
+            if markers <= dependencies:
+                return framework
+        
+        click.echo("Could not determine framework from package.json.")
+        return 'unknown'
     
     except Exception as e:
         click.echo(f"Error detecting framework: {e}", err=True)
         return 'unknown'
 
+# next.config wrappers that load the project's own config and force a static export.
+# The config may be an object or a (possibly async) function of the build phase.
+NEXT_CONFIG_CJS_WRAPPER = """\
+const base = require('./%s');
+module.exports = async (...args) => ({
+  ...(typeof base === 'function' ? await base(...args) : base),
+  output: 'export',
+});
+"""
+NEXT_CONFIG_ESM_WRAPPER = """\
+import base from './%s';
+export default async (...args) => ({
+  ...(typeof base === 'function' ? await base(...args) : base),
+  output: 'export',
+});
+"""
+
+def _write_next_export_config(repo_path, package_data):
+    """Make a Next.js build produce a static export in out/.
+    
+    The project's config is renamed and replaced by a wrapper that imports it
+    and sets output: 'export', whatever syntax the original config uses.
+    Only the temporary checkout is modified.
+    """
+    is_esm = package_data.get('type') == 'module'
+    for config_name in ('next.config.js', 'next.config.mjs', 'next.config.ts'):
+        config_path = os.path.join(repo_path, config_name)
+        if os.path.exists(config_path):
+            break
+    else:
+        # No config at all; add one that only sets the output mode
+        with open(os.path.join(repo_path, 'next.config.mjs'), 'w') as f:
+            f.write("export default { output: 'export' };\n")
+        return
+    
+    if config_name == 'next.config.ts':
+        click.echo("next.config.ts found; make sure it sets output: 'export' for a static build.")
+        return
+    
+    stem, ext = os.path.splitext(config_name)
+    original_name = f"{stem}.original{ext}"
+    os.replace(config_path, os.path.join(repo_path, original_name))
+    
+    wrapper = NEXT_CONFIG_ESM_WRAPPER if is_esm or ext == '.mjs' else NEXT_CONFIG_CJS_WRAPPER
+    with open(config_path, 'w') as f:
+        f.write(wrapper % original_name)
+
+# Directories checked, in order, for a build committed to the repository
+PREBUILT_DIRS = ('out', 'build', 'dist', 'public')
+
+def _find_prebuilt_dir(repo_path):
+    """Find a committed build directory containing index.html.
+    
+    Returns:
+        str: Path to the directory, or None if there is none
+    """
+    with os.scandir(repo_path) as it:
+        dirs = {entry.name: entry.path for entry in it if entry.is_dir(follow_symlinks=False)}
+    
+    for dir_name in PREBUILT_DIRS:
+        if dir_name in dirs and os.path.isfile(os.path.join(dirs[dir_name], 'index.html')):
+            return dirs[dir_name]
+    return None
+
 def build_project(repo_path, framework):
     """Build the project based on the detected framework.
     
     Returns:
         str: Path to the build directory if successful, None otherwise
     """
-    current_dir = os.getcwd()
+    # With DEPLOY_TOOL_SKIP_BUILD=1, deploy a build committed to the repository as is
+    if os.environ.get('DEPLOY_TOOL_SKIP_BUILD') == '1':
+        prebuilt_dir = _find_prebuilt_dir(repo_path)
+        if prebuilt_dir:
+            click.echo(f"Using existing prebuilt directory: {prebuilt_dir}")
+            return prebuilt_dir
+        click.echo("No prebuilt directory found, building the project.")
+    
     try:
-        os.chdir(repo_path)
-        
         # Install dependencies
-        click.echo("Installing dependencies...")
-        os.system('npm install')
+        NPM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        install_command = _install_command(repo_path)
+        click.echo(f"Installing dependencies with {' '.join(install_command[:2])}...")
+        if install_command is NPM_CI_COMMAND:
+            # npm ci refuses a package-lock.json that is out of sync with package.json
+            if _run(install_command, repo_path, check=False) != 0:
+                click.echo("npm ci failed, retrying with npm install...")
+                _run(NPM_INSTALL_COMMAND, repo_path)
+        else:
+            _run(install_command, repo_path)
         
         # Build based on framework
         click.echo(f"Building {framework} project...")
         
         if framework == 'nextjs':
             # Check if there's an export script in package.json
-            import json
-            with open('package.json', 'r') as f:
-                package_data = json.load(f)
+            package_data = _load_json(os.path.join(repo_path, 'package.json'))
             
             has_export_script = 'export' in package_data.get('scripts', {})
             
             if has_export_script:
                 # Older Next.js versions with separate export command
-                os.system('npm run build && npm run export')
+                _run(['npm', 'run', 'build'], repo_path)
+                _run(['npm', 'run', 'export'], repo_path)
             else:
                 # Newer Next.js versions (>=12) with built-in export
-                # Modify next.config.js to add output: 'export'
-                next_config_path = os.path.join(repo_path, 'next.config.js')
-                
-                if os.path.exists(next_config_path):
-                    with open(next_config_path, 'r') as f:
-                        config_content = f.read()
-                    
-                    if 'output:' not in config_content:
-                        # Backup original config
-                        with open(next_config_path + '.bak', 'w') as f:
-                            f.write(config_content)
-                        
-                        # Add output: 'export' to config
-                        if 'module.exports = {' in config_content:
-                            new_content = config_content.replace(
-                                'module.exports = {', 
-                                'module.exports = {\n  output: "export",')
-                            with open(next_config_path, 'w') as f:
-                                f.write(new_content)
+                _write_next_export_config(repo_path, package_data)
                 
                 # Run the build with export output
-                os.system('npm run build')
+                _run(['npm', 'run', 'build'], repo_path)
             
             # Check for out directory (standard export location)
             build_dir = os.path.join(repo_path, 'out')
@@ -133,8 +417,7 @@ def build_project(repo_path, framework):
             package_json_path = os.path.join(repo_path, 'package.json')
             is_cra = False
             if os.path.exists(package_json_path):
-                with open(package_json_path, 'r') as f:
-                    package_data = json.load(f)
+                package_data = _load_json(package_json_path)
                 
                 # Check for CRA dependencies or scripts
                 deps = {**package_data.get('dependencies', {}), **package_data.get('devDependencies', {})}
@@ -155,12 +438,13 @@ def build_project(repo_path, framework):
             
             # Run the build command
             click.echo("Building React application...")
-            build_result = os.system('npm run build')
+            build_result = _run(['npm', 'run', 'build'], repo_path, check=False)
             
             if build_result != 0:
                 click.echo("Build failed. Trying alternative build approaches...")
                 # Some projects might use different build scripts
-                os.system('npm run prod') or os.system('npm run production')
+                if _run(['npm', 'run', 'prod'], repo_path, check=False) != 0:
+                    _run(['npm', 'run', 'production'], repo_path)
             
             build_dir = os.path.join(repo_path, 'build')
             
@@ -176,8 +460,7 @@ def build_project(repo_path, framework):
             angular_config_path = os.path.join(repo_path, 'angular.json')
             if os.path.exists(angular_config_path):
                 try:
-                    with open(angular_config_path, 'r') as f:
-                        angular_config = json.load(f)
+                    angular_config = _load_json(angular_config_path)
                     
                     # Get default project from angular.json
                     if "defaultProject" in angular_config:
@@ -192,7 +475,7 @@ def build_project(repo_path, framework):
                     click.echo(f"Could not parse angular.json: {e}", err=True)
             
             # Build the Angular project
-            os.system('npm run build -- --configuration=production')
+            _run(['npm', 'run', 'build', '--', '--configuration=production'], repo_path)
             
             # Check for project-specific build directory
             if project_name:
@@ -212,37 +495,44 @@ def build_project(repo_path, framework):
         if not os.path.exists(build_dir):
             click.echo(f"Expected build directory not found: {build_dir}")
             
-            # Look for common build directories
-            possible_dirs = [
-                os.path.join(repo_path, 'build'),
-                os.path.join(repo_path, 'dist'),
-                os.path.join(repo_path, '.next'),
-                os.path.join(repo_path, 'public')
-            ]
+            # Look for common build directories, listing the repository root once
+            with os.scandir(repo_path) as it:
+                root_entries = {entry.name: entry for entry in it}
             
-            for possible_dir in possible_dirs:
-                if os.path.exists(possible_dir) and os.path.isdir(possible_dir):
-                    click.echo(f"Using alternative build directory: {possible_dir}")
-                    
-                    # Check if this directory contains index.html
-                    if os.path.exists(os.path.join(possible_dir, 'index.html')):
-                        return possible_dir
-                    
-                    # If no index.html in the root, check for one level down (common in some builds)
-                    subdirs = [d for d in os.listdir(possible_dir) 
-                              if os.path.isdir(os.path.join(possible_dir, d))]
-                    
-                    for subdir in subdirs:
-                        subdir_path = os.path.join(possible_dir, subdir)
-                        if os.path.exists(os.path.join(subdir_path, 'index.html')):
-                            click.echo(f"Found index.html in subdirectory: {subdir_path}")
-                            return subdir_path
-                    
-                    # If we got here but didn't find an index.html, use the directory anyway
+            for dir_name in ('build', 'dist', '.next', 'public'):
+                entry = root_entries.get(dir_name)
+                if entry is None or not entry.is_dir(follow_symlinks=False):
+                    continue
+                
+                possible_dir = entry.path
+                click.echo(f"Using alternative build directory: {possible_dir}")
+                
+                # Look for index.html and collect subdirectories in the same pass
+                has_index = False
+                subdirs = []
+                with os.scandir(possible_dir) as it:
+                    for child in it:
+                        if child.name == 'index.html':
+                            has_index = True
+                        elif child.is_dir(follow_symlinks=False):
+                            subdirs.append(child)
+                
+                # Check if this directory contains index.html
+                if has_index:
                     return possible_dir
+                
+                # If no index.html in the root, check for one level down (common in some builds)
+                for child in subdirs:
+                    with os.scandir(child.path) as it:
+                        if any(grandchild.name == 'index.html' for grandchild in it):
+                            click.echo(f"Found index.html in subdirectory: {child.path}")
+                            return child.path
+                
+                # If we got here but didn't find an index.html, use the directory anyway
+                return possible_dir
             
             # Check for direct presence of index.html in repo root (simple static sites)
-            if os.path.exists(os.path.join(repo_path, 'index.html')):
+            if 'index.html' in root_entries:
                 click.echo("Found index.html in repository root, using that as the build directory")
                 return repo_path
                 
@@ -251,9 +541,10 @@ def build_project(repo_path, framework):
         
         return build_dir
     
+    except subprocess.CalledProcessError as e:
+        click.echo(f"Error building project: command exited with code {e.returncode}", err=True)
+        return None
+    
     except Exception as e:
         click.echo(f"Error building project: {e}", err=True)
         return None
-    
-    finally:
-        os.chdir(current_dir)
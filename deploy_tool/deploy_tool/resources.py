@@ -2,15 +2,52 @@
 Helper module for listing resources.
 """
 import click
-from .aws import get_aws_session
+import io
+from concurrent.futures import ThreadPoolExecutor
 from .config import load_state
 
+# Maximum number of buckets checked concurrently
+STATUS_WORKERS = 32
+
+def _bucket_summary(bucket_name, region, exists):
+    """Build the summary entry for a bucket."""
+    return {
+        'name': bucket_name,
+        'status': "active" if exists else "not found",
+        'website_url': f"http://{bucket_name}.s3-website.{region}.amazonaws.com" if exists else "N/A"
+    }
+
+def _bucket_exists(s3, bucket_name):
+    """Check whether a single bucket exists with a HEAD request."""
+    try:
+        s3.head_bucket(Bucket=bucket_name)
+        return True
+    except Exception:
+        return False
+
+def _list_bucket_names(s3):
+    """Get the names of all buckets in the account with a single request.
+    
+    Returns:
+        set: Bucket names, or None if the credentials may not list buckets
+    """
+    from botocore.exceptions import ClientError
+    
+    try:
+        return {bucket['Name'] for bucket in s3.list_buckets()['Buckets']}
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'AccessDenied':
+            return None
+        raise
+
 def get_resources_summary():
     """Get a summary of all resources created by deploy-tool.
     
     Returns:
         dict: Summary of resources
     """
+    from .aws import get_aws_session, get_aws_client
+    
     session = get_aws_session()
     if not session:
         return None
@@ -24,38 +61,39 @@ def get_resources_summary():
         'other_resources': []
     }
     
+    bucket_names = []
     for resource in resources:
         if resource['type'] == 's3_bucket':
-            # Get additional details from AWS
-            try:
-                s3 = session.client('s3')
-                region = session.region_name
-                
-                # Check if bucket exists
-                try:
-                    s3.head_bucket(Bucket=resource['name'])
-                    status = "active"
-                    website_url = f"http://{resource['name']}.s3-website.{region}.amazonaws.com"
-                except Exception:
-                    status = "not found"
-                    website_url = "N/A"
-                
-                summary['s3_buckets'].append({
-                    'name': resource['name'],
-                    'status': status,
-                    'website_url': website_url
-                })
-            except Exception as e:
-                summary['s3_buckets'].append({
-                    'name': resource['name'],
-                    'status': f"error: {str(e)}",
-                    'website_url': "N/A"
-                })
+            bucket_names.append(resource['name'])
         elif resource['type'] == 'cloudfront_distribution':
             summary['cloudfront_distributions'].append(resource)
         else:
             summary['other_resources'].append(resource)
     
+    if bucket_names:
+        # Get additional details from AWS
+        try:
+            s3 = get_aws_client('s3')
+            region = session.region_name
+            existing = _list_bucket_names(s3)
+            if existing is not None:
+                found = [name in existing for name in bucket_names]
+            else:
+                # Without ListAllMyBuckets permission, check the buckets one by one
+                with ThreadPoolExecutor(max_workers=min(STATUS_WORKERS, len(bucket_names))) as executor:
+                    found = list(executor.map(lambda name: _bucket_exists(s3, name), bucket_names))
+            
+            summary['s3_buckets'] = [
+                _bucket_summary(name, region, exists)
+                for name, exists in zip(bucket_names, found)
+            ]
+        except Exception as e:
+            summary['s3_buckets'] = [{
+                'name': name,
+                'status': f"error: {str(e)}",
+                'website_url': "N/A"
+            } for name in bucket_names]
+    
     return summary
 
 def display_resources():
@@ -65,22 +103,27 @@ def display_resources():
         click.echo("No resources found or cannot connect to AWS.")
         return
     
+    # Build the whole listing first and write it out at once
+    buf = io.StringIO()
+    
     # Display S3 buckets
     if summary['s3_buckets']:
-        click.echo("\nS3 Buckets:")
+        buf.write("\nS3 Buckets:\n")
         for bucket in summary['s3_buckets']:
-            click.echo(f"  - {bucket['name']} ({bucket['status']})")
+            buf.write(f"  - {bucket['name']} ({bucket['status']})\n")
             if bucket['website_url'] != "N/A":
-                click.echo(f"    URL: {bucket['website_url']}")
+                buf.write(f"    URL: {bucket['website_url']}\n")
     
     # Display CloudFront distributions
     if summary['cloudfront_distributions']:
-        click.echo("\nCloudFront Distributions:")
+        buf.write("\nCloudFront Distributions:\n")
         for dist in summary['cloudfront_distributions']:
-            click.echo(f"  - {dist['name']}")
+            buf.write(f"  - {dist['name']}\n")
     
     # Display other resources
     if summary['other_resources']:
-        click.echo("\nOther Resources:")
+        buf.write("\nOther Resources:\n")
         for res in summary['other_resources']:
-            click.echo(f"  - {res['type']}: {res['name']}")
+            buf.write(f"  - {res['type']}: {res['name']}\n")
+    
+    click.echo(buf.getvalue(), nl=False)
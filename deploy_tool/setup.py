@@ -1,15 +1,19 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name="deploy-tool",
     version="0.1.0",
-    packages=find_packages(),
-    include_package_data=True,
+    packages=["deploy_tool"],
+    zip_safe=False,
     install_requires=[
         "click",
-        "boto3",
+        "boto3>=1.26.0",
         "gitpython",
     ],
+    extras_require={
+        "async": ["aioboto3"],
+        "fast": ["orjson"],
+    },
     entry_points="""
         [console_scripts]
         deploy-tool=deploy_tool.cli:cli
@@ -0,0 +1,25 @@
+"""
+Tests for choosing Cache-Control headers for uploaded files.
+"""
+import pytest
+
+from deploy_tool.cli import HASHED_NAME_RE
+
+
+@pytest.mark.parametrize('name', [
+    'main.3f2a9c1d.js',
+    'styles-9b8e7f6a5c4d.css',
+    'chunk.abcdef12.mjs',
+])
+def test_hashed_asset_names_match(name):
+    assert HASHED_NAME_RE.search(name)
+
+
+@pytest.mark.parametrize('name', [
+    'report-20240101.pdf',
+    'invoice.12345678.html',
+    'logo.png',
+    'main.js',
+])
+def test_plain_names_do_not_match(name):
+    assert not HASHED_NAME_RE.search(name)
@@ -0,0 +1,93 @@
+"""
+Tests for the rollback command.
+"""
+import json
+import sys
+import types
+
+import pytest
+from click.testing import CliRunner
+
+from deploy_tool import cli as cli_module
+from deploy_tool import config
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    """Point the state file at a temporary directory with an empty cache."""
+    monkeypatch.setattr(config, 'CONFIG_DIR', tmp_path)
+    monkeypatch.setattr(config, 'STATE_FILE', tmp_path / 'state.json')
+    monkeypatch.setattr(config, '_state_cache', None)
+    monkeypatch.setattr(config, '_state_dirty', False)
+    monkeypatch.setattr(config, '_state_mtime', None)
+    return tmp_path / 'state.json'
+
+
+@pytest.fixture
+def fake_aws(monkeypatch):
+    """Replace the aws module with one that records deletions instead of calling AWS."""
+    aws = types.ModuleType('deploy_tool.aws')
+    aws.failing = set()
+    aws.deleted = []
+    aws.verify_aws_credentials = lambda: (True, "ok")
+    aws.get_aws_client = lambda service_name: object()
+
+    def delete_s3_bucket(bucket_name):
+        if bucket_name in aws.failing:
+            return False
+        aws.deleted.append(bucket_name)
+        return True
+
+    aws.delete_s3_bucket = delete_s3_bucket
+    monkeypatch.setitem(sys.modules, 'deploy_tool.aws', aws)
+    return aws
+
+
+def write_state(path, resources):
+    path.write_text(json.dumps({'resources': resources}))
+
+
+def test_rollback_deletes_buckets_and_clears_state(state_file, fake_aws):
+    write_state(state_file, [
+        {'type': 's3_bucket', 'name': 'site-a'},
+        {'type': 's3_bucket', 'name': 'site-b'},
+    ])
+
+    result = CliRunner().invoke(cli_module.cli, ['rollback', '--yes'])
+
+    assert result.exit_code == 0, result.output
+    assert sorted(fake_aws.deleted) == ['site-a', 'site-b']
+    assert "Rollback completed successfully." in result.output
+    assert not state_file.exists()
+
+
+def test_rollback_keeps_buckets_that_failed(state_file, fake_aws):
+    write_state(state_file, [
+        {'type': 's3_bucket', 'name': 'site-a'},
+        {'type': 's3_bucket', 'name': 'site-b'},
+    ])
+    fake_aws.failing.add('site-b')
+
+    result = CliRunner().invoke(cli_module.cli, ['rollback', '--yes'])
+
+    assert result.exit_code == 0, result.output
+    assert "1 S3 bucket(s) could not be deleted" in result.output
+    state = json.loads(state_file.read_text())
+    assert state['resources'] == [{'type': 's3_bucket', 'name': 'site-b'}]
+
+
+def test_rollback_ignores_stale_stored_index(state_file, fake_aws):
+    # Written by a tool that appended a bucket without updating by_type
+    state_file.write_text(json.dumps({
+        'resources': [
+            {'type': 's3_bucket', 'name': 'site-a'},
+            {'type': 's3_bucket', 'name': 'site-b'},
+        ],
+        'by_type': {'s3_bucket': ['site-a']},
+    }))
+
+    result = CliRunner().invoke(cli_module.cli, ['rollback', '--yes'])
+
+    assert result.exit_code == 0, result.output
+    assert sorted(fake_aws.deleted) == ['site-a', 'site-b']
+    assert not state_file.exists()